@@ -23,6 +23,7 @@
 #include <dolfin/mesh/Mesh.h>
 #include <dolfin/mesh/MeshEntity.h>
 #include <dolfin/mesh/MeshIterator.h>
+#include <numeric>
 #include <unsupported/Eigen/CXX11/Tensor>
 #include <utility>
 #include <vector>
@@ -159,8 +160,9 @@ void Function::eval(Eigen::Ref<Eigen::Array<PetscScalar, Eigen::Dynamic,
   assert(_function_space->mesh);
   const mesh::Mesh& mesh = *_function_space->mesh;
 
-  // Find the cell that contains x
+  // Find the cell that contains each point
   const int gdim = x.cols();
+  std::vector<unsigned int> cells(x.rows());
   Eigen::Vector3d point = Eigen::Vector3d::Zero();
   for (unsigned int i = 0; i < x.rows(); ++i)
   {
@@ -186,11 +188,45 @@ void Function::eval(Eigen::Ref<Eigen::Array<PetscScalar, Eigen::Dynamic,
       }
     }
 
-    // Create cell that contains point
-    const mesh::Cell cell(mesh, id);
+    cells[i] = id;
+  }
 
-    // Call evaluate function
-    eval(values.row(i), x.row(i), cell);
+  // Order points by cell so that all points in a cell are evaluated
+  // together, which computes the cell geometry and expansion
+  // coefficients once per cell rather than once per point
+  std::vector<int> perm(x.rows());
+  std::iota(perm.begin(), perm.end(), 0);
+  std::stable_sort(perm.begin(), perm.end(),
+                   [&cells](int a, int b) { return cells[a] < cells[b]; });
+
+  EigenRowArrayXXd x_cell;
+  Eigen::Array<PetscScalar, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>
+      values_cell;
+  std::size_t p0 = 0;
+  while (p0 < perm.size())
+  {
+    // Find range of points in the same cell
+    const unsigned int cell_index = cells[perm[p0]];
+    std::size_t p1 = p0 + 1;
+    while (p1 < perm.size() and cells[perm[p1]] == cell_index)
+      ++p1;
+
+    // Pack points
+    const int num_points = p1 - p0;
+    x_cell.resize(num_points, gdim);
+    values_cell.resize(num_points, values.cols());
+    for (int i = 0; i < num_points; ++i)
+      x_cell.row(i) = x.row(perm[p0 + i]);
+
+    // Create cell that contains points and call evaluate function
+    const mesh::Cell cell(mesh, cell_index);
+    eval(values_cell, x_cell, cell);
+
+    // Unpack values
+    for (int i = 0; i < num_points; ++i)
+      values.row(perm[p0 + i]) = values_cell.row(i);
+
+    p0 = p1;
   }
 }
 //-----------------------------------------------------------------------------
@@ -203,9 +239,8 @@ void Function::eval(
         x,
     const mesh::Cell& cell) const
 {
-  // FIXME: This function needs to be changed to handle an arbitrary
-  // number of points for efficiency
-
+  // Evaluates at all points x in the cell together, so the cell
+  // geometry and expansion coefficients are computed once per call
   assert(_function_space);
   assert(_function_space->mesh);
   const mesh::Mesh& mesh = *_function_space->mesh;
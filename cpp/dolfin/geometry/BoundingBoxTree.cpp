@@ -117,13 +117,30 @@ BoundingBoxTree::BoundingBoxTree(const std::vector<Eigen::Vector3d>& points,
 std::vector<unsigned int>
 BoundingBoxTree::compute_collisions(const Eigen::Vector3d& point) const
 {
-  // Call recursive find function
+  // Call iterative find function
   std::vector<unsigned int> entities;
   _compute_collisions_point(*this, point, num_bboxes() - 1, entities, nullptr);
 
   return entities;
 }
 //-----------------------------------------------------------------------------
+std::vector<std::vector<unsigned int>> BoundingBoxTree::compute_collisions(
+    const Eigen::Ref<
+        const Eigen::Array<double, Eigen::Dynamic, 3, Eigen::RowMajor>>& points)
+    const
+{
+  // Search tree for each point in turn
+  std::vector<std::vector<unsigned int>> entities(points.rows());
+  for (Eigen::Index i = 0; i < points.rows(); ++i)
+  {
+    const Eigen::Vector3d p = points.row(i).matrix().transpose();
+    _compute_collisions_point(*this, p, num_bboxes() - 1, entities[i],
+                              nullptr);
+  }
+
+  return entities;
+}
+//-----------------------------------------------------------------------------
 std::pair<std::vector<unsigned int>, std::vector<unsigned int>>
 BoundingBoxTree::compute_collisions(const BoundingBoxTree& tree) const
 {
@@ -154,7 +171,7 @@ BoundingBoxTree::compute_entity_collisions(const Eigen::Vector3d& point,
         "Point-in-entity is only implemented for cells");
   }
 
-  // Call recursive find function to compute bounding box candidates
+  // Call iterative find function to compute bounding box candidates
   std::vector<unsigned int> entities;
   _compute_collisions_point(*this, point, num_bboxes() - 1, entities, &mesh);
 
@@ -362,38 +379,64 @@ void BoundingBoxTree::_compute_collisions_point(
     unsigned int node, std::vector<unsigned int>& entities,
     const mesh::Mesh* mesh)
 {
-  // Get bounding box for current node
-  const BBox& bbox = tree._bboxes[node];
+  // Traverse depth-first with an explicit stack. The tree is built by
+  // median splitting, so its depth is about log2(num_bboxes) and a
+  // fixed-size stack suffices; nodes spill to the heap only if it
+  // ever fills up.
+  std::array<unsigned int, 64> stack;
+  std::vector<unsigned int> overflow;
+  int top = 0;
+  stack[top++] = node;
+  while (top > 0 or !overflow.empty())
+  {
+    if (!overflow.empty())
+    {
+      node = overflow.back();
+      overflow.pop_back();
+    }
+    else
+      node = stack[--top];
 
-  // If point is not in bounding box, then don't search further
-  if (!tree.point_in_bbox(point.data(), node))
-    return;
+    // Get bounding box for current node
+    const BBox& bbox = tree._bboxes[node];
 
-  // If box is a leaf (which we know contains the point), then add it
-  else if (is_leaf(bbox, node))
-  {
-    // child_1 denotes entity for leaves
-    const unsigned int entity_index = bbox[1];
+    // If point is not in bounding box, then don't search further
+    if (!tree.point_in_bbox(point.data(), node))
+      continue;
 
-    // If we have a mesh, check that the candidate is really a collision
-    if (mesh)
+    // If box is a leaf (which we know contains the point), then add it
+    else if (is_leaf(bbox, node))
     {
-      // Get cell
-      mesh::Cell cell(*mesh, entity_index);
-      if (CollisionPredicates::collides(cell, point))
+      // child_1 denotes entity for leaves
+      const unsigned int entity_index = bbox[1];
+
+      // If we have a mesh, check that the candidate is really a
+      // collision
+      if (mesh)
+      {
+        // Get cell
+        mesh::Cell cell(*mesh, entity_index);
+        if (CollisionPredicates::collides(cell, point))
+          entities.push_back(entity_index);
+      }
+
+      // Otherwise, add the candidate
+      else
         entities.push_back(entity_index);
     }
 
-    // Otherwise, add the candidate
+    // Check both children, pushing child_1 first so that child_0 is
+    // visited first (same order as a recursive search)
     else
-      entities.push_back(entity_index);
-  }
-
-  // Check both children
-  else
-  {
-    _compute_collisions_point(tree, point, bbox[0], entities, mesh);
-    _compute_collisions_point(tree, point, bbox[1], entities, mesh);
+    {
+      for (unsigned int child : {bbox[1], bbox[0]})
+      {
+        if (top < (int)stack.size())
+          stack[top++] = child;
+        else
+          overflow.push_back(child);
+      }
+    }
   }
 }
 //-----------------------------------------------------------------------------
@@ -894,13 +937,16 @@ bool BoundingBoxTree::bbox_in_bbox(const double* a, unsigned int node,
 bool BoundingBoxTree::point_in_bbox(const double* x, const unsigned int node,
                                     double rtol) const
 {
+  // Accumulate the comparisons without branching so that the loop
+  // (at most three iterations) can be unrolled and vectorised
   const double* b = _bbox_coordinates.data() + 2 * _gdim * node;
+  bool inside = true;
   for (int i = 0; i < _gdim; ++i)
   {
     const double eps = rtol * (b[i + _gdim] - b[i]);
-    if (b[i] - eps > x[i] or x[i] > b[i + _gdim] + eps)
-      return false;
+    inside &= !(b[i] - eps > x[i]);
+    inside &= !(x[i] > b[i + _gdim] + eps);
   }
-  return true;
+  return inside;
 }
 //-----------------------------------------------------------------------------
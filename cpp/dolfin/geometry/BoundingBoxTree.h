@@ -58,6 +58,13 @@ public:
   std::vector<unsigned int>
   compute_collisions(const Eigen::Vector3d& point) const;
 
+  /// Compute all collisions between bounding boxes and each row of
+  /// _points_, returning one list of entities per point
+  std::vector<std::vector<unsigned int>>
+  compute_collisions(const Eigen::Ref<const Eigen::Array<
+                         double, Eigen::Dynamic, 3, Eigen::RowMajor>>& points)
+      const;
+
   /// Compute all collisions between bounding boxes and _BoundingBoxTree_
   std::pair<std::vector<unsigned int>, std::vector<unsigned int>>
   compute_collisions(const BoundingBoxTree& tree) const;
@@ -145,7 +152,7 @@ private:
   // Note that these functions are made static for consistency as
   // some of them need to deal with more than one tree.
 
-  // Compute collisions with point (recursive)
+  // Compute collisions with point (iterative)
   static void _compute_collisions_point(const BoundingBoxTree& tree,
                                         const Eigen::Vector3d& point,
                                         unsigned int node,
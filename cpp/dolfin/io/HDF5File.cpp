@@ -20,6 +20,7 @@
 #include <dolfin/function/FunctionSpace.h>
 #include <dolfin/la/PETScVector.h>
 #include <dolfin/la/utils.h>
+#include <dolfin/mesh/Connectivity.h>
 #include <dolfin/mesh/DistributedMeshTools.h>
 #include <dolfin/mesh/Mesh.h>
 #include <dolfin/mesh/MeshEntity.h>
@@ -1060,14 +1061,9 @@ void HDF5File::write(const mesh::MeshValueCollection<bool>& mesh_values,
   // HDF5 does not implement bool, use int and copy
 
   mesh::MeshValueCollection<int> mvc_int(mesh_values.mesh(), mesh_values.dim());
-  const std::map<std::pair<std::size_t, std::size_t>, bool>& values
-      = mesh_values.values();
-  for (auto mesh_value_it = values.begin(); mesh_value_it != values.end();
-       ++mesh_value_it)
-  {
-    mvc_int.set_value(mesh_value_it->first.first, mesh_value_it->first.second,
-                      mesh_value_it->second ? 1 : 0);
-  }
+  mvc_int.set_values(mesh_values.cell_indices(),
+                     mesh_values.local_entities().cast<std::int32_t>(),
+                     mesh_values.values().cast<int>());
 
   write_mesh_value_collection(mvc_int, name);
 }
@@ -1080,15 +1076,10 @@ HDF5File::read_mvc_bool(std::shared_ptr<const mesh::Mesh> mesh,
 
   auto mvc_int = read_mesh_value_collection<int>(mesh, name);
 
-  const std::map<std::pair<std::size_t, std::size_t>, int>& values
-      = mvc_int.values();
   mesh::MeshValueCollection<bool> mvc(mesh, mvc_int.dim());
-  for (auto mesh_value_it = values.begin(); mesh_value_it != values.end();
-       ++mesh_value_it)
-  {
-    mvc.set_value(mesh_value_it->first.first, mesh_value_it->first.second,
-                  (mesh_value_it->second != 0));
-  }
+  const Eigen::Array<bool, Eigen::Dynamic, 1> values = (mvc_int.values() != 0);
+  mvc.set_values(mvc_int.cell_indices(),
+                 mvc_int.local_entities().cast<std::int32_t>(), values);
 
   return mvc;
 }
@@ -1102,8 +1093,9 @@ void HDF5File::write_mesh_value_collection(
   const std::size_t dim = mesh_values.dim();
   std::shared_ptr<const mesh::Mesh> mesh = mesh_values.mesh();
 
-  const std::map<std::pair<std::size_t, std::size_t>, T>& values
-      = mesh_values.values();
+  const auto cell_indices = mesh_values.cell_indices();
+  const auto local_entities = mesh_values.local_entities();
+  const auto values = mesh_values.values();
 
   const mesh::CellType entity_type
       = mesh::cell_entity_type(mesh->cell_type, dim);
@@ -1119,24 +1111,25 @@ void HDF5File::write_mesh_value_collection(
   mesh->create_connectivity(tdim, dim);
   const std::vector<std::int64_t>& global_indices
       = mesh->topology().global_indices(0);
-  for (auto& p : values)
+  for (Eigen::Index i = 0; i < values.size(); ++i)
   {
-    // mesh::MeshEntity cell = mesh::Cell(*mesh, p.first.first);
-    mesh::MeshEntity cell(*mesh, tdim, p.first.first);
+    // mesh::MeshEntity cell = mesh::Cell(*mesh, cell_indices[i]);
+    mesh::MeshEntity cell(*mesh, tdim, cell_indices[i]);
     if (dim != tdim)
     {
-      const unsigned int entity_local_idx = cell.entities(dim)[p.first.second];
+      const unsigned int entity_local_idx
+          = cell.entities(dim)[local_entities[i]];
       cell = mesh::MeshEntity(*mesh, dim, entity_local_idx);
     }
     for (auto& v : mesh::EntityRange<mesh::Vertex>(cell))
       topology.push_back(global_indices[v.index()]);
-    value_data.push_back(p.second);
+    value_data.push_back(values[i]);
   }
 
   const bool mpi_io = _mpi_comm.size() > 1 ? true : false;
   std::vector<std::int64_t> global_size(2);
 
-  global_size[0] = MPI::sum(_mpi_comm.comm(), values.size());
+  global_size[0] = MPI::sum(_mpi_comm.comm(), mesh_values.size());
   global_size[1] = num_vertices_per_entity;
 
   write_data(name + "/topology", topology, global_size, mpi_io);
@@ -1316,14 +1309,57 @@ HDF5File::read_mesh_value_collection(std::shared_ptr<const mesh::Mesh> mesh,
   MPI::all_to_all(_mpi_comm.comm(), send_entities, recv_entities);
   MPI::all_to_all(_mpi_comm.comm(), send_data, recv_data);
 
-  mesh::MeshValueCollection<T> mvc(mesh, dim);
+  // Find the cell and local entity index of each received entity
+  // (using the first cell of the entity, as
+  // mesh::MeshValueCollection::set_value does) and set all values at
+  // once, since inserting one at a time out of order is slow
+  const std::size_t tdim = mesh->topology().dim();
+  std::shared_ptr<const mesh::Connectivity> connectivity;
+  if (dim != tdim)
+  {
+    mesh->create_connectivity(dim, tdim);
+    connectivity = mesh->topology().connectivity(dim, tdim);
+    assert(connectivity);
+  }
+
+  std::size_t num_values = 0;
   for (std::size_t i = 0; i != num_processes; ++i)
   {
     assert(recv_entities[i].size() == recv_data[i].size());
+    num_values += recv_data[i].size();
+  }
+
+  Eigen::Array<std::int32_t, Eigen::Dynamic, 1> cell_indices(num_values);
+  Eigen::Array<std::int32_t, Eigen::Dynamic, 1> local_entities(num_values);
+  Eigen::Array<T, Eigen::Dynamic, 1> values(num_values);
+  std::size_t k = 0;
+  for (std::size_t i = 0; i != num_processes; ++i)
+  {
     for (std::size_t j = 0; j != recv_data[i].size(); ++j)
-      mvc.set_value(recv_entities[i][j], recv_data[i][j]);
+    {
+      const std::size_t entity_index = recv_entities[i][j];
+      if (connectivity)
+      {
+        assert(connectivity->size(entity_index) > 0);
+        const mesh::MeshEntity entity(*mesh, dim, entity_index);
+        const mesh::MeshEntity cell(*mesh, tdim,
+                                    connectivity->connections(entity_index)[0]);
+        cell_indices[k] = cell.index();
+        local_entities[k] = cell.index(entity);
+      }
+      else
+      {
+        cell_indices[k] = entity_index;
+        local_entities[k] = 0;
+      }
+      values[k] = recv_data[i][j];
+      ++k;
+    }
   }
 
+  mesh::MeshValueCollection<T> mvc(mesh, dim);
+  mvc.set_values(cell_indices, local_entities, values);
+
   return mvc;
 }
 //-----------------------------------------------------------------------------
@@ -930,7 +930,9 @@ void XDMFFile::write_mesh_value_collection(
   const std::int32_t num_vertices_per_cell
       = mesh::num_cell_vertices(cell_entity_type(mesh->cell_type, cell_dim));
 
-  const std::map<std::pair<std::size_t, std::size_t>, T>& values = mvc.values();
+  const auto cell_indices = mvc.cell_indices();
+  const auto local_entities = mvc.local_entities();
+  const auto values = mvc.values();
   const std::int64_t num_cells = values.size();
   const std::int64_t num_cells_global = MPI::sum(mesh->mpi_comm(), num_cells);
 
@@ -950,13 +952,13 @@ void XDMFFile::write_mesh_value_collection(
   const std::vector<std::int64_t>& global_indices
       = mesh->topology().global_indices(0);
   mesh->create_connectivity(tdim, cell_dim);
-  for (auto& p : values)
+  for (Eigen::Index i = 0; i < values.size(); ++i)
   {
-    mesh::MeshEntity cell = mesh::Cell(*mesh, p.first.first);
+    mesh::MeshEntity cell = mesh::Cell(*mesh, cell_indices[i]);
     if (cell_dim != tdim)
     {
       const std::int32_t entity_local_idx
-          = cell.entities(cell_dim)[p.first.second];
+          = cell.entities(cell_dim)[local_entities[i]];
       cell = mesh::MeshEntity(*mesh, cell_dim, entity_local_idx);
     }
 
@@ -969,7 +971,7 @@ void XDMFFile::write_mesh_value_collection(
         topology_data.push_back(global_indices[v.index()]);
     }
 
-    value_data.push_back(p.second);
+    value_data.push_back(values[i]);
   }
 
   const std::string mvc_dataset_name
@@ -1190,16 +1192,57 @@ XDMFFile::read_mesh_value_collection(std::shared_ptr<const mesh::Mesh> mesh,
   MPI::all_to_all(_mpi_comm.comm(), send_entities, recv_entities);
   MPI::all_to_all(_mpi_comm.comm(), send_data, recv_data);
 
-  mesh::MeshValueCollection<T> mvc(mesh, dim);
+  // Find the cell and local entity index of each received entity
+  // (using the first cell of the entity, as
+  // mesh::MeshValueCollection::set_value does) and set all values at
+  // once, since inserting one at a time out of order is slow
+  const int tdim = mesh->topology().dim();
+  std::shared_ptr<const mesh::Connectivity> connectivity;
+  if (dim != tdim)
+  {
+    mesh->create_connectivity(dim, tdim);
+    connectivity = mesh->topology().connectivity(dim, tdim);
+    assert(connectivity);
+  }
+
+  std::size_t num_values = 0;
   for (std::int32_t i = 0; i != num_processes; ++i)
   {
     assert(recv_entities[i].size() == recv_data[i].size());
+    num_values += recv_data[i].size();
+  }
+
+  Eigen::Array<std::int32_t, Eigen::Dynamic, 1> cell_indices(num_values);
+  Eigen::Array<std::int32_t, Eigen::Dynamic, 1> local_entities(num_values);
+  Eigen::Array<T, Eigen::Dynamic, 1> values(num_values);
+  std::size_t k = 0;
+  for (std::int32_t i = 0; i != num_processes; ++i)
+  {
     for (std::size_t j = 0; j != recv_data[i].size(); ++j)
     {
-      mvc.set_value(recv_entities[i][j], recv_data[i][j]);
+      const std::int32_t entity_index = recv_entities[i][j];
+      if (connectivity)
+      {
+        assert(connectivity->size(entity_index) > 0);
+        const mesh::MeshEntity entity(*mesh, dim, entity_index);
+        const mesh::MeshEntity cell(*mesh, tdim,
+                                    connectivity->connections(entity_index)[0]);
+        cell_indices[k] = cell.index();
+        local_entities[k] = cell.index(entity);
+      }
+      else
+      {
+        cell_indices[k] = entity_index;
+        local_entities[k] = 0;
+      }
+      values[k] = recv_data[i][j];
+      ++k;
     }
   }
 
+  mesh::MeshValueCollection<T> mvc(mesh, dim);
+  mvc.set_values(cell_indices, local_entities, values);
+
   return mvc;
 }
 //-----------------------------------------------------------------------------
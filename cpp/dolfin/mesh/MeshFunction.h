@@ -152,8 +152,7 @@ MeshFunction<T>::MeshFunction(std::shared_ptr<const Mesh> mesh, std::size_t dim,
 {
   assert(mesh);
   mesh->create_entities(dim);
-  _values.resize(mesh->num_entities(dim));
-  _values = value;
+  _values.setConstant(mesh->num_entities(dim), value);
 }
 //---------------------------------------------------------------------------
 template <typename T>
@@ -181,15 +180,15 @@ MeshFunction<T>::MeshFunction(std::shared_ptr<const Mesh> mesh,
 
   // Iterate over all values
   std::unordered_set<std::size_t> entities_values_set;
-  typename std::map<std::pair<std::size_t, std::size_t>, T>::const_iterator it;
-  const std::map<std::pair<std::size_t, std::size_t>, T>& values
-      = value_collection.values();
-  for (it = values.begin(); it != values.end(); ++it)
+  const auto cell_indices = value_collection.cell_indices();
+  const auto local_entities = value_collection.local_entities();
+  const auto values = value_collection.values();
+  for (Eigen::Index i = 0; i < values.size(); ++i)
   {
     // Get value collection entry data
-    const std::size_t cell_index = it->first.first;
-    const std::size_t local_entity = it->first.second;
-    const T& value = it->second;
+    const std::size_t cell_index = cell_indices[i];
+    const std::size_t local_entity = local_entities[i];
+    const T& value = values[i];
 
     std::size_t entity_index = 0;
     if (d != D)
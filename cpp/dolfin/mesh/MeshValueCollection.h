@@ -9,9 +9,15 @@
 #include "Mesh.h"
 #include "MeshEntity.h"
 #include "MeshFunction.h"
-#include <map>
+#include <algorithm>
+#include <boost/container/vector.hpp>
+#include <cstdint>
+#include <limits>
 #include <memory>
+#include <numeric>
+#include <tuple>
 #include <utility>
+#include <vector>
 
 namespace dolfin
 {
@@ -112,7 +118,9 @@ public:
   bool set_value(std::size_t cell_index, std::size_t local_entity,
                  const T& value);
 
-  /// Set value for given entity index
+  /// Set value for given entity index. Setting values one at a time
+  /// out of (cell, local entity) order is O(n) per value; use
+  /// set_values or assignment from a MeshFunction for many values.
   ///
   /// @param    entity_index (std::size_t)
   ///         Index of the entity.
@@ -124,6 +132,29 @@ public:
   ///         an existing value.
   bool set_value(std::size_t entity_index, const T& value);
 
+  /// Set marker values for a list of entities, each defined by a cell
+  /// index and a local entity index. The entities may be given in any
+  /// order; if an entity appears more than once, the last value is
+  /// used. Prefer this to repeated calls to set_value when setting
+  /// many values.
+  ///
+  /// @param    cell_indices (Eigen::Array<std::int32_t>)
+  ///         The indices of the cells.
+  /// @param    local_entities (Eigen::Array<std::int32_t>)
+  ///         The local indices of the entities relative to the cells.
+  /// @param    values (Eigen::Array<T>)
+  ///         The values of the markers.
+  ///
+  /// @return    std::size_t
+  ///         The number of new values inserted (existing values are
+  ///         overwritten).
+  std::size_t set_values(
+      const Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>&
+          cell_indices,
+      const Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>&
+          local_entities,
+      const Eigen::Ref<const Eigen::Array<T, Eigen::Dynamic, 1>>& values);
+
   /// Get marker value for given entity defined by a cell index and
   /// a local entity index
   ///
@@ -136,19 +167,48 @@ public:
   ///         The value of the marker.
   T get_value(std::size_t cell_index, std::size_t local_entity);
 
-  /// Get all values
+  /// Get cell indices of all values, sorted by cell index and local
+  /// entity index. The returned array is a view of the internal
+  /// storage, and is invalidated by any change to the collection
+  /// (set_value, set_values, reserve, clear or assignment).
   ///
-  /// @return    std::map<std::pair<std::size_t, std::size_t>, T>
-  ///         A map from positions to values.
-  std::map<std::pair<std::size_t, std::size_t>, T>& values();
+  /// @return    Eigen::Array<std::int32_t>
+  ///         The cell indices.
+  Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>
+  cell_indices() const;
+
+  /// Get local entity indices of all values (same order as
+  /// cell_indices()). The returned array is a view, invalidated by any
+  /// change to the collection (see cell_indices()).
+  ///
+  /// @return    Eigen::Array<std::int8_t>
+  ///         The local entity indices.
+  Eigen::Ref<const Eigen::Array<std::int8_t, Eigen::Dynamic, 1>>
+  local_entities() const;
+
+  /// Get all values (same order as cell_indices()). The returned
+  /// array is a view, invalidated by any change to the collection (see
+  /// cell_indices()).
+  ///
+  /// @return    Eigen::Array<T>
+  ///         The values.
+  Eigen::Ref<Eigen::Array<T, Eigen::Dynamic, 1>> values();
 
   /// Get all values (const version)
   ///
-  /// @return    std::map<std::pair<std::size_t, std::size_t>, T>
-  ///         A map from positions to values.
-  const std::map<std::pair<std::size_t, std::size_t>, T>& values() const;
+  /// @return    Eigen::Array<T>
+  ///         The values.
+  Eigen::Ref<const Eigen::Array<T, Eigen::Dynamic, 1>> values() const;
 
-  /// Clear all values
+  /// Reserve storage for a given number of values, e.g. the number
+  /// of cells times the number of entities per cell, to avoid
+  /// reallocation when values are inserted
+  ///
+  /// @param    n (std::size_t)
+  ///         The number of values to reserve storage for.
+  void reserve(std::size_t n);
+
+  /// Clear all values (storage is kept for reuse)
   void clear();
 
   /// Return informal string representation (pretty-print)
@@ -164,14 +224,32 @@ public:
   std::string name = "f";
 
 private:
+  // Return position of (cell_index, local_entity) in the sorted
+  // arrays, or the position where it should be inserted
+  std::size_t find(std::int32_t cell_index, std::int32_t local_entity) const;
+
+  // Insert value for (cell_index, local_entity) if not present,
+  // otherwise overwrite existing value if overwrite is true. Returns
+  // true if a new value is inserted. Inserting out of order is O(n),
+  // so this is only for setting individual values; see set_values.
+  bool insert(std::int32_t cell_index, std::int32_t local_entity,
+              const T& value, bool overwrite);
+
   // Associated mesh
   std::shared_ptr<const Mesh> _mesh;
 
   // Topological dimension
   int _dim;
 
-  // The values
-  std::map<std::pair<std::size_t, std::size_t>, T> _values;
+  // Cell index and local entity index of each value, sorted by cell
+  // index and then local entity index. A cell has few entities of a
+  // given dimension, so the local index fits in a byte.
+  std::vector<std::int32_t> _cell_indices;
+  std::vector<std::int8_t> _local_entities;
+
+  // The values (boost::container::vector stores bool values
+  // contiguously, unlike std::vector<bool>)
+  boost::container::vector<T> _values;
 };
 
 //---------------------------------------------------------------------------
@@ -190,49 +268,7 @@ MeshValueCollection<T>::MeshValueCollection(
     const MeshFunction<T>& mesh_function)
     : _mesh(mesh_function.mesh()), _dim(mesh_function.dim())
 {
-  assert(_mesh);
-  const int D = _mesh->topology().dim();
-
-  // Prefetch values of mesh function
-  Eigen::Ref<const Eigen::Array<T, Eigen::Dynamic, 1>> mf_values
-      = mesh_function.values();
-
-  // Handle cells as a special case
-  if (D == _dim)
-  {
-    for (Eigen::Index cell_index = 0; cell_index < mf_values.size();
-         ++cell_index)
-    {
-      const std::pair<std::size_t, std::size_t> key(cell_index, 0);
-      _values.insert({key, mf_values[cell_index]});
-    }
-  }
-  else
-  {
-    _mesh->create_connectivity(_dim, D);
-    const Connectivity& connectivity = _mesh->topology().connectivity(_dim, D);
-    for (Eigen::Index entity_index = 0; entity_index < mf_values.size();
-         ++entity_index)
-    {
-      // Find the cell
-      assert(connectivity.size(entity_index) > 0);
-      const MeshEntity entity(*_mesh, _dim, entity_index);
-      for (int i = 0; i < connectivity.size(entity_index); ++i)
-      {
-        // Create cell
-        const mesh::Cell cell(*_mesh,
-                              connectivity.connections(entity_index)[i]);
-
-        // Find the local entity index
-        const std::size_t local_entity = cell.index(entity);
-
-        // Insert into map
-        const std::pair<std::size_t, std::size_t> key(cell.index(),
-                                                      local_entity);
-        _values.insert({key, mf_values[entity_index]});
-      }
-    }
-  }
+  *this = mesh_function;
 }
 //---------------------------------------------------------------------------
 template <typename T>
@@ -245,50 +281,71 @@ operator=(const MeshFunction<T>& mesh_function)
   assert(_mesh);
   const int D = _mesh->topology().dim();
 
-  // FIXME: Use iterators
-
   // Prefetch values of mesh function
   Eigen::Ref<const Eigen::Array<T, Eigen::Dynamic, 1>> mf_values
       = mesh_function.values();
 
-  // Handle cells as a special case
-  if (D == _dim)
+  // If the collection is empty, build the sorted arrays directly by
+  // visiting cells in order, and the entities of each cell in local
+  // order, rather than inserting values one at a time
+  if (_values.empty())
   {
-    for (Eigen::Index cell_index = 0; cell_index < mf_values.size();
-         ++cell_index)
+    if (D == _dim)
     {
-      const std::pair<std::size_t, std::size_t> key(cell_index, 0);
-      _values.insert({key, mf_values[cell_index]});
+      const std::size_t num_cells = mf_values.size();
+      _cell_indices.resize(num_cells);
+      std::iota(_cell_indices.begin(), _cell_indices.end(), 0);
+      _local_entities.assign(num_cells, 0);
+      _values.assign(mf_values.data(), mf_values.data() + num_cells);
     }
-  }
-  else
-  {
-    _mesh->create_connectivity(_dim, D);
-    assert(_mesh->topology().connectivity(_dim, D));
-    const Connectivity& connectivity = *_mesh->topology().connectivity(_dim, D);
-    for (Eigen::Index entity_index = 0; entity_index < mf_values.size();
-         ++entity_index)
+    else
     {
-      // Find the cell
-      assert(connectivity.size(entity_index) > 0);
-      const MeshEntity entity(*_mesh, _dim, entity_index);
-      for (std::size_t i = 0; i < connectivity.size(entity_index); ++i)
+      _mesh->create_connectivity(D, _dim);
+      assert(_mesh->topology().connectivity(D, _dim));
+      const Connectivity& connectivity
+          = *_mesh->topology().connectivity(D, _dim);
+      const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>& offsets
+          = connectivity.entity_positions();
+      Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>
+          cell_entities = connectivity.connections();
+
+      const std::size_t num_values = cell_entities.size();
+      _cell_indices.resize(num_values);
+      _local_entities.resize(num_values);
+      for (Eigen::Index c = 0; c < offsets.size() - 1; ++c)
       {
-        // Create cell
-        const mesh::Cell cell(*_mesh,
-                              connectivity.connections(entity_index)[i]);
-
-        // Find the local entity index
-        const std::size_t local_entity = cell.index(entity);
-
-        // Insert into map
-        const std::pair<std::size_t, std::size_t> key(cell.index(),
-                                                      local_entity);
-        _values.insert({key, mf_values[entity_index]});
+        for (std::int32_t j = offsets[c]; j < offsets[c + 1]; ++j)
+        {
+          _cell_indices[j] = c;
+          _local_entities[j] = static_cast<std::int8_t>(j - offsets[c]);
+        }
       }
+
+      // Gather values in a separate flat loop, which the compiler can
+      // vectorise (e.g. using gather instructions)
+      _values.resize(num_values);
+      T* values = _values.data();
+      const std::int32_t* entities = cell_entities.data();
+      const T* mf_data = mf_values.data();
+      for (std::size_t j = 0; j < num_values; ++j)
+        values[j] = mf_data[entities[j]];
     }
+
+    return *this;
   }
 
+  // Otherwise, build the entries of the mesh function in a new
+  // collection and add the existing entries with a single call to
+  // set_values (existing values take precedence, as they are set last)
+  MeshValueCollection<T> mvc(_mesh, _dim);
+  mvc = mesh_function;
+  mvc.set_values(cell_indices(),
+                 local_entities().template cast<std::int32_t>(), values());
+
+  _cell_indices.swap(mvc._cell_indices);
+  _local_entities.swap(mvc._local_entities);
+  _values.swap(mvc._values);
+
   return *this;
 }
 //---------------------------------------------------------------------------
@@ -329,17 +386,14 @@ bool MeshValueCollection<T>::set_value(std::size_t cell_index,
         "A mesh has not been associated with this MeshValueCollection");
   }
 
-  const std::pair<std::size_t, std::size_t> pos(cell_index, local_entity);
-  std::pair<typename std::map<std::pair<std::size_t, std::size_t>, T>::iterator,
-            bool>
-      it = _values.insert({pos, value});
-
-  // If an item with same key already exists the value has not been
-  // set and we need to update it
-  if (!it.second)
-    it.first->second = value;
+  // Local entity indices are stored as std::int8_t
+  if (local_entity > (std::size_t)std::numeric_limits<std::int8_t>::max())
+  {
+    throw std::runtime_error("Local entity index out of range: "
+                             + std::to_string(local_entity));
+  }
 
-  return it.second;
+  return insert(cell_index, local_entity, value, true);
 }
 //---------------------------------------------------------------------------
 template <typename T>
@@ -358,19 +412,7 @@ bool MeshValueCollection<T>::set_value(std::size_t entity_index, const T& value)
   if (_dim == (int)D)
   {
     // Set local entity index to zero when we mark a cell
-    const std::pair<std::size_t, std::size_t> pos(entity_index, 0);
-    std::pair<
-        typename std::map<std::pair<std::size_t, std::size_t>, T>::iterator,
-        bool>
-        it;
-    it = _values.insert({pos, value});
-
-    // If an item with same key already exists the value has not been
-    // set and we need to update it
-    if (!it.second)
-      it.first->second = value;
-
-    return it.second;
+    return insert(entity_index, 0, value, true);
   }
 
   // Get mesh connectivity d --> D
@@ -388,18 +430,98 @@ bool MeshValueCollection<T>::set_value(std::size_t entity_index, const T& value)
   const std::size_t local_entity = cell.index(entity);
 
   // Add value
-  const std::pair<std::size_t, std::size_t> pos(cell.index(), local_entity);
-  std::pair<typename std::map<std::pair<std::size_t, std::size_t>, T>::iterator,
-            bool>
-      it;
-  it = _values.insert({pos, value});
-
-  // If an item with same key already exists the value has not been
-  // set and we need to update it
-  if (!it.second)
-    it.first->second = value;
-
-  return it.second;
+  return insert(cell.index(), local_entity, value, true);
+}
+//---------------------------------------------------------------------------
+template <typename T>
+std::size_t MeshValueCollection<T>::set_values(
+    const Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>&
+        cell_indices,
+    const Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>&
+        local_entities,
+    const Eigen::Ref<const Eigen::Array<T, Eigen::Dynamic, 1>>& values)
+{
+  assert(_dim >= 0);
+  if (!_mesh)
+  {
+    throw std::runtime_error(
+        "A mesh has not been associated with this MeshValueCollection");
+  }
+
+  if (cell_indices.size() != local_entities.size()
+      or cell_indices.size() != values.size())
+  {
+    throw std::runtime_error(
+        "Cell indices, local entities and values must have the same size");
+  }
+
+  // Local entity indices are stored as std::int8_t
+  if ((local_entities < 0).any()
+      or (local_entities > std::numeric_limits<std::int8_t>::max()).any())
+  {
+    throw std::runtime_error("Local entity index out of range");
+  }
+
+  // Append the new entries after the existing (sorted and unique)
+  // entries
+  const std::size_t num_old = _values.size();
+  reserve(num_old + values.size());
+  for (Eigen::Index i = 0; i < cell_indices.size(); ++i)
+  {
+    _cell_indices.push_back(cell_indices[i]);
+    _local_entities.push_back(static_cast<std::int8_t>(local_entities[i]));
+    _values.push_back(values[i]);
+  }
+
+  auto key_less = [this](std::size_t a, std::size_t b) {
+    return std::tie(_cell_indices[a], _local_entities[a])
+           < std::tie(_cell_indices[b], _local_entities[b]);
+  };
+
+  // Nothing more to do if the entries are still strictly increasing,
+  // e.g. when filling an empty collection in cell order
+  const std::size_t num_values = _values.size();
+  bool sorted = true;
+  for (std::size_t i = (num_old > 0 ? num_old : 1); i < num_values; ++i)
+  {
+    if (!key_less(i - 1, i))
+    {
+      sorted = false;
+      break;
+    }
+  }
+  if (sorted)
+    return num_values - num_old;
+
+  // Sort by (cell index, local entity index). The sort is stable, so
+  // for a repeated key the entry inserted last comes last.
+  std::vector<std::size_t> perm(num_values);
+  std::iota(perm.begin(), perm.end(), 0);
+  std::stable_sort(perm.begin(), perm.end(), key_less);
+
+  // Copy entries in sorted order, keeping the last entry for each key
+  std::vector<std::int32_t> sorted_cell_indices;
+  std::vector<std::int8_t> sorted_local_entities;
+  boost::container::vector<T> sorted_values;
+  sorted_cell_indices.reserve(num_values);
+  sorted_local_entities.reserve(num_values);
+  sorted_values.reserve(num_values);
+  for (std::size_t i = 0; i < num_values; ++i)
+  {
+    const std::size_t p = perm[i];
+    if (i + 1 < num_values and !key_less(p, perm[i + 1]))
+      continue;
+    sorted_cell_indices.push_back(_cell_indices[p]);
+    sorted_local_entities.push_back(_local_entities[p]);
+    sorted_values.push_back(_values[p]);
+  }
+
+  _cell_indices.swap(sorted_cell_indices);
+  _local_entities.swap(sorted_local_entities);
+  _values.swap(sorted_values);
+
+  // Existing entries are unique and all kept, so the remainder are new
+  return _values.size() - num_old;
 }
 //---------------------------------------------------------------------------
 template <typename T>
@@ -408,42 +530,106 @@ T MeshValueCollection<T>::get_value(std::size_t cell_index,
 {
   assert(_dim >= 0);
 
-  const std::pair<std::size_t, std::size_t> pos(cell_index, local_entity);
-  const typename std::map<std::pair<std::size_t, std::size_t>,
-                          T>::const_iterator it
-      = _values.find(pos);
-
-  if (it == _values.end())
+  const std::size_t pos = find(cell_index, local_entity);
+  if (pos == _values.size() or _cell_indices[pos] != (std::int32_t)cell_index
+      or _local_entities[pos] != (std::int32_t)local_entity)
   {
     throw std::runtime_error(
         "No value stored for cell index: " + std::to_string(cell_index)
         + " and local index: " + std::to_string(local_entity));
   }
 
-  return it->second;
+  return _values[pos];
 }
 //---------------------------------------------------------------------------
 template <typename T>
-std::map<std::pair<std::size_t, std::size_t>, T>&
-MeshValueCollection<T>::values()
+Eigen::Ref<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>
+MeshValueCollection<T>::cell_indices() const
 {
-  return _values;
+  return Eigen::Map<const Eigen::Array<std::int32_t, Eigen::Dynamic, 1>>(
+      _cell_indices.data(), _cell_indices.size());
 }
 //---------------------------------------------------------------------------
 template <typename T>
-const std::map<std::pair<std::size_t, std::size_t>, T>&
+Eigen::Ref<const Eigen::Array<std::int8_t, Eigen::Dynamic, 1>>
+MeshValueCollection<T>::local_entities() const
+{
+  return Eigen::Map<const Eigen::Array<std::int8_t, Eigen::Dynamic, 1>>(
+      _local_entities.data(), _local_entities.size());
+}
+//---------------------------------------------------------------------------
+template <typename T>
+Eigen::Ref<Eigen::Array<T, Eigen::Dynamic, 1>> MeshValueCollection<T>::values()
+{
+  return Eigen::Map<Eigen::Array<T, Eigen::Dynamic, 1>>(_values.data(),
+                                                        _values.size());
+}
+//---------------------------------------------------------------------------
+template <typename T>
+Eigen::Ref<const Eigen::Array<T, Eigen::Dynamic, 1>>
 MeshValueCollection<T>::values() const
 {
-  return _values;
+  return Eigen::Map<const Eigen::Array<T, Eigen::Dynamic, 1>>(_values.data(),
+                                                              _values.size());
+}
+//---------------------------------------------------------------------------
+template <typename T>
+void MeshValueCollection<T>::reserve(std::size_t n)
+{
+  _cell_indices.reserve(n);
+  _local_entities.reserve(n);
+  _values.reserve(n);
 }
 //---------------------------------------------------------------------------
 template <typename T>
 void MeshValueCollection<T>::clear()
 {
+  _cell_indices.clear();
+  _local_entities.clear();
   _values.clear();
 }
 //---------------------------------------------------------------------------
 template <typename T>
+std::size_t MeshValueCollection<T>::find(std::int32_t cell_index,
+                                         std::int32_t local_entity) const
+{
+  // Find the (short) range of entries for the cell, then the local
+  // entity within that range
+  const auto cell_range = std::equal_range(
+      _cell_indices.begin(), _cell_indices.end(), cell_index);
+  const auto begin = _local_entities.begin()
+                     + (cell_range.first - _cell_indices.begin());
+  const auto end = _local_entities.begin()
+                   + (cell_range.second - _cell_indices.begin());
+  return std::lower_bound(begin, end, local_entity) - _local_entities.begin();
+}
+//---------------------------------------------------------------------------
+template <typename T>
+bool MeshValueCollection<T>::insert(std::int32_t cell_index,
+                                    std::int32_t local_entity, const T& value,
+                                    bool overwrite)
+{
+  const std::size_t pos = find(cell_index, local_entity);
+
+  // If an item with same key already exists, update it
+  if (pos < _values.size() and _cell_indices[pos] == cell_index
+      and _local_entities[pos] == local_entity)
+  {
+    if (overwrite)
+      _values[pos] = value;
+    return false;
+  }
+
+  // Insert new item, keeping the arrays sorted (appending when values
+  // are inserted in order)
+  _cell_indices.insert(_cell_indices.begin() + pos, cell_index);
+  _local_entities.insert(_local_entities.begin() + pos,
+                         static_cast<std::int8_t>(local_entity));
+  _values.insert(_values.begin() + pos, value);
+  return true;
+}
+//---------------------------------------------------------------------------
+template <typename T>
 std::string MeshValueCollection<T>::str(bool verbose) const
 {
   std::stringstream s;
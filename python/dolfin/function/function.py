@@ -7,7 +7,7 @@
 """Finite element functions"""
 
 import typing
-from functools import singledispatch
+import weakref
 
 import numpy as np
 from petsc4py import PETSc
@@ -16,6 +16,57 @@ import ufl
 from dolfin import common, cpp, function
 from dolfin.function import functionspace
 
+# Value type of Function evaluations
+_EVAL_DTYPE = np.complex128 if common.has_petsc_complex else np.float64
+
+# Compiled C kernels for numba expressions, or None where compilation
+# failed. Entries are dropped when the expression is garbage collected.
+_numba_kernels = weakref.WeakKeyDictionary()
+
+
+def _is_numba_function(u) -> bool:
+    """Check if u is a numba-compiled (njit) function"""
+    return type(u).__module__.startswith("numba") and hasattr(u, "py_func")
+
+
+def _numba_kernel_address(u) -> typing.Optional[int]:
+    """Return the address of a C function with the signature used by
+    Function.interpolate_ptr that wraps the numba-compiled expression
+    u(values, x), or None if numba cannot compile the wrapper. The
+    result is computed on first use and cached.
+
+    """
+    try:
+        kernel = _numba_kernels[u]
+        return None if kernel is None else kernel.address
+    except KeyError:
+        pass
+
+    import numba
+    c_signature = numba.types.void(
+        numba.types.CPointer(numba.typeof(PETSc.ScalarType())),
+        numba.types.intc, numba.types.intc,
+        numba.types.CPointer(numba.types.double), numba.types.intc)
+
+    # Compile a copy of the expression into the kernel, so that the
+    # cached kernel does not hold a reference to u (which would keep the
+    # weakly keyed cache entry alive). njit sets nopython itself, and
+    # warns if it is passed.
+    options = {k: v for k, v in u.targetoptions.items() if k not in ("nopython", "forceobj")}
+    expr = numba.njit(**options)(u.py_func)
+
+    try:
+        @numba.cfunc(c_signature, nopython=True)
+        def kernel(values_, num_points, value_size, x_, gdim):
+            values = numba.carray(values_, (num_points, value_size), dtype=PETSc.ScalarType)
+            x = numba.carray(x_, (num_points, gdim), dtype=np.float64)
+            expr(values, x)
+    except numba.errors.TypingError:
+        kernel = None
+
+    _numba_kernels[u] = kernel
+    return None if kernel is None else kernel.address
+
 
 class Function(ufl.Coefficient):
     """A finite element function that is represented by a function
@@ -48,6 +99,10 @@ class Function(ufl.Coefficient):
         # Store DOLFIN FunctionSpace object
         self._V = V
 
+        # Cache geometric dimension and value size for evaluation
+        self._gdim = self.geometric_dimension()
+        self._value_size = ufl.product(self.ufl_element().value_shape())
+
     @property
     def function_space(self) -> function.functionspace.FunctionSpace:
         """Return the FunctionSpace"""
@@ -83,23 +138,44 @@ class Function(ufl.Coefficient):
             # Scalar evaluation
             return self(*x)
 
-    def __call__(self, x: np.ndarray, bb_tree: cpp.geometry.BoundingBoxTree) -> np.ndarray:
-        """Evaluate Function at points x, where x has shape (num_points, gdim)"""
-        _x = np.asarray(x, dtype=np.float)
-        num_points = _x.shape[0] if len(_x.shape) > 1 else 1
-        _x = np.reshape(_x, (num_points, -1))
-        if _x.shape[1] != self.geometric_dimension():
+    def __call__(self, x: np.ndarray, bb_tree: cpp.geometry.BoundingBoxTree,
+                 values: typing.Optional[np.ndarray] = None) -> np.ndarray:
+        """Evaluate Function at points x, where x has shape (num_points, gdim)
+
+        An optional C-contiguous array ``values`` with num_points *
+        value_size entries can be passed to hold the result, which
+        avoids allocating a new array on each call when evaluating
+        repeatedly.
+
+        """
+        _x = np.ascontiguousarray(x, dtype=np.float64)
+        value_size = self._value_size
+        if values is not None and not (values.flags.c_contiguous and values.dtype == _EVAL_DTYPE):
+            # Reshaping would otherwise evaluate into a copy, leaving values unchanged
+            raise ValueError("values must be a C-contiguous array of type {}.".format(np.dtype(_EVAL_DTYPE).name))
+        if _x.ndim == 1:
+            # Single point: evaluate directly into a flat array
+            if _x.shape[0] != self._gdim:
+                raise ValueError("Wrong geometric dimension for coordinate(s).")
+            if values is None:
+                values = np.empty(value_size, dtype=_EVAL_DTYPE)
+            elif values.size != value_size:
+                raise ValueError("Wrong size for values array, expected {} entries.".format(value_size))
+            self._cpp_object.eval_point(np.reshape(values, (-1, )), _x, bb_tree)
+            return values
+
+        num_points = _x.shape[0]
+        if _x.shape[1] != self._gdim:
             raise ValueError("Wrong geometric dimension for coordinate(s).")
 
-        value_size = ufl.product(self.ufl_element().value_shape())
-        if common.has_petsc_complex:
-            values = np.empty((num_points, value_size), dtype=np.complex128)
+        if values is not None:
+            _values = np.reshape(values, (num_points, value_size))
         else:
-            values = np.empty((num_points, value_size))
+            values = _values = np.empty((num_points, value_size), dtype=_EVAL_DTYPE)
 
         # Call the evaluation
-        self._cpp_object.eval(values, _x, bb_tree)
-        if num_points == 1:
+        self._cpp_object.eval(_values, _x, bb_tree)
+        if num_points == 1 and values is _values:
             values = np.reshape(values, (-1, ))
 
         return values
@@ -113,18 +189,23 @@ class Function(ufl.Coefficient):
     def interpolate(self, u) -> None:
         """Interpolate an expression"""
 
-        @singledispatch
-        def _interpolate(u):
-            try:
-                self._cpp_object.interpolate(u)
-            except TypeError:
-                self._cpp_object.interpolate(u._cpp_object)
-
-        @_interpolate.register(int)
-        def _(u, verbose=False):
+        if isinstance(u, int):
             self._cpp_object.interpolate_ptr(u)
-
-        _interpolate(u)
+            return
+
+        if _is_numba_function(u):
+            # Call the compiled expression through a C function pointer,
+            # falling back to the Python callback if numba cannot type
+            # the wrapper
+            address = _numba_kernel_address(u)
+            if address is not None:
+                self._cpp_object.interpolate_ptr(address)
+                return
+
+        try:
+            self._cpp_object.interpolate(u)
+        except TypeError:
+            self._cpp_object.interpolate(u._cpp_object)
 
     def compute_point_values(self):
         return self._cpp_object.compute_point_values()
@@ -181,7 +262,10 @@ class Function(ufl.Coefficient):
         num_sub_spaces = self.function_space.num_sub_spaces()
         if num_sub_spaces == 1:
             raise RuntimeError("No subfunctions to extract")
-        return tuple(self.sub(i) for i in range(num_sub_spaces))
+        base_name = str(self)
+        vec = self.vector
+        return tuple(Function(V, vec, name="{}-{}".format(base_name, i))
+                     for i, V in enumerate(self._V.sub_all()))
 
     def collapse(self):
         u_collapsed = self._cpp_object.collapse()
@@ -30,6 +30,9 @@ class FunctionSpace(ufl.FunctionSpace):
                  cppV: typing.Optional[cpp.function.FunctionSpace] = None):
         """Create a finite element function space."""
 
+        # Sub spaces, created on first request
+        self._sub_spaces = {}
+
         # Create function space from a UFL element and existing cpp
         # FunctionSpace
         if cppV is not None:
@@ -74,10 +77,19 @@ class FunctionSpace(ufl.FunctionSpace):
 
     def sub(self, i: int):
         """Return the i-th sub space."""
+        try:
+            return self._sub_spaces[i]
+        except KeyError:
+            pass
         assert self.ufl_element().num_sub_elements() > i
         sub_element = self.ufl_element().sub_elements()[i]
         cppV_sub = self._cpp_object.sub([i])
-        return FunctionSpace(None, sub_element, cppV_sub)
+        V = self._sub_spaces[i] = FunctionSpace(None, sub_element, cppV_sub)
+        return V
+
+    def sub_all(self):
+        """Return a list of all sub spaces."""
+        return [self.sub(i) for i in range(self.ufl_element().num_sub_elements())]
 
     def component(self):
         """Return the component relative to the parent space."""
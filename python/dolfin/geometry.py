@@ -17,6 +17,10 @@ class BoundingBoxTree:
         """Compute collisions with the point"""
         return self._cpp_object.compute_collisions(point)
 
+    def compute_collisions_points(self, points):
+        """Compute collisions with each row of an (n, 3) array of points"""
+        return self._cpp_object.compute_collisions_points(points)
+
     def compute_collisions_bb(self, bb: "BoundingBoxTree"):
         """Compute collisions with the bounding box"""
         return self._cpp_object.compute_collisions(bb._cpp_object)
@@ -6,7 +6,14 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
 import functools
-
+import hashlib
+import importlib.machinery
+import importlib.util
+import os
+import shutil
+import tempfile
+
+import cffi
 import dolfin.pkgconfig
 import ffc
 import ufl
@@ -110,3 +117,76 @@ def ffc_jit(ufl_object, form_compiler_parameters=None):
         raise TypeError(type(ufl_object))
 
     return r[0][0]
+
+
+_cffi_expressions = {}
+
+
+@mpi_jit_decorator
+def cffi_expression(exprs, cache_dir=None):
+    """Compile C expressions into a kernel for Function.interpolate
+
+    Each expression gives one value component in terms of the point
+    coordinates x[0], ..., x[gdim - 1], e.g. ``"sin(x[0]) * x[1]"``.
+    Compiled modules are cached on disk by the SHA-1 hash of their
+    source, so each distinct set of expressions is compiled only once.
+    Returns the address of the kernel.
+
+    """
+    if isinstance(exprs, str):
+        exprs = [exprs]
+    scalar_type = "double _Complex" if common.has_petsc_complex else "double"
+    decl = ("void eval({}* values, int num_points, int value_size, "
+            "const double* x_, int gdim)").format(scalar_type)
+    body = "\n".join("    values[i*value_size + {}] = {};".format(k, e)
+                     for k, e in enumerate(exprs))
+    code = ("#include <math.h>\n"
+            "{}\n{{\n"
+            "  for (int i = 0; i < num_points; ++i)\n  {{\n"
+            "    const double* x = x_ + i*gdim;\n"
+            "{}\n  }}\n}}\n").format(decl, body)
+
+    # Re-use a kernel already loaded in this process
+    try:
+        return _cffi_expressions[code][1]
+    except KeyError:
+        pass
+
+    module_name = "_dolfin_expr_" + hashlib.sha1(code.encode()).hexdigest()
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "dolfin")
+
+    # Look for a compiled module in the cache, and build it on a miss
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        path = os.path.join(cache_dir, module_name + suffix)
+        if os.path.exists(path):
+            break
+    else:
+        # Build in a private directory, then move the finished module
+        # into the cache atomically, so that other processes sharing the
+        # cache never load a partially written file
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as build_dir:
+            ffi = cffi.FFI()
+            ffi.set_source(module_name, code)
+            ffi.cdef(decl + ";")
+            build_path = ffi.compile(tmpdir=build_dir)
+            path = os.path.join(cache_dir, os.path.basename(build_path))
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copy(build_path, tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    address = int(module.ffi.cast("uintptr_t",
+                                  module.ffi.addressof(module.lib, "eval")))
+
+    # Keep the module alive for as long as its kernel may be used
+    _cffi_expressions[code] = (module, address)
+    return address
@@ -5,6 +5,7 @@
 // SPDX-License-Identifier:    LGPL-3.0-or-later
 
 #include "casters.h"
+#include <cfloat>
 #include <cstdint>
 #include <dolfin/fem/DofMap.h>
 #include <dolfin/fem/FiniteElement.h>
@@ -12,7 +13,10 @@
 #include <dolfin/function/FunctionSpace.h>
 #include <dolfin/geometry/BoundingBoxTree.h>
 #include <dolfin/la/PETScVector.h>
+#include <dolfin/mesh/Geometry.h>
 #include <dolfin/mesh/Mesh.h>
+#include <dolfin/mesh/MeshEntity.h>
+#include <limits>
 #include <memory>
 #include <petsc4py/petsc4py.h>
 #include <pybind11/eigen.h>
@@ -105,6 +109,54 @@ void function(py::module& m)
                &dolfin::function::Function::eval, py::const_),
            py::arg("values"), py::arg("x"), py::arg("bb_tree"),
            "Evaluate Function")
+      .def("eval_point",
+           [](const dolfin::function::Function& self,
+              Eigen::Ref<Eigen::Array<PetscScalar, Eigen::Dynamic, 1>> values,
+              const Eigen::Ref<const Eigen::VectorXd> x,
+              const dolfin::geometry::BoundingBoxTree& bb_tree) {
+             if (values.size() != self.value_size())
+             {
+               throw std::runtime_error(
+                   "Values array has wrong size for Function value size");
+             }
+
+             // Find the cell containing the point, padding the point to
+             // size 3 (bounding box requires 3d point)
+             const dolfin::mesh::Mesh& mesh = *self.function_space()->mesh;
+             if (x.size() != mesh.geometry().dim())
+               throw std::runtime_error("Point has wrong geometric dimension");
+             Eigen::Vector3d point = Eigen::Vector3d::Zero();
+             point.head(x.size()) = x;
+             unsigned int id
+                 = bb_tree.compute_first_entity_collision(point, mesh);
+
+             // If not found, use the closest cell if it is within
+             // 2*DBL_EPSILON (as Function::eval does)
+             if (id == std::numeric_limits<unsigned int>::max())
+             {
+               std::pair<unsigned int, double> close
+                   = bb_tree.compute_closest_entity(point, mesh);
+               if (close.second < 2.0 * DBL_EPSILON)
+                 id = close.first;
+               else
+               {
+                 throw std::runtime_error(
+                     "Cannot evaluate function at point. The point is not "
+                     "inside the domain.");
+               }
+             }
+
+             // View the point and the values as single rows, and
+             // evaluate in the cell directly
+             Eigen::Map<const dolfin::EigenRowArrayXXd> _x(x.data(), 1,
+                                                          x.size());
+             Eigen::Map<Eigen::Array<PetscScalar, Eigen::Dynamic,
+                                     Eigen::Dynamic, Eigen::RowMajor>>
+                 _values(values.data(), 1, values.size());
+             self.eval(_values, _x, dolfin::mesh::Cell(mesh, id));
+           },
+           py::arg("values"), py::arg("x"), py::arg("bb_tree"),
+           "Evaluate Function at a single point")
       .def("compute_point_values",
            &dolfin::function::Function::compute_point_values,
            "Compute values at all mesh points")
@@ -40,6 +40,13 @@ void geometry(py::module& m)
                dolfin::geometry::BoundingBoxTree::*)(
                const dolfin::geometry::BoundingBoxTree&) const)
                & dolfin::geometry::BoundingBoxTree::compute_collisions)
+      .def("compute_collisions_points",
+           (std::vector<std::vector<unsigned int>>(
+               dolfin::geometry::BoundingBoxTree::*)(
+               const Eigen::Ref<const Eigen::Array<
+                   double, Eigen::Dynamic, 3, Eigen::RowMajor>>&) const)
+               & dolfin::geometry::BoundingBoxTree::compute_collisions,
+           "Compute collisions with each row of an (n, 3) array of points")
       .def("compute_entity_collisions",
            (std::vector<unsigned int>(dolfin::geometry::BoundingBoxTree::*)(
                const Eigen::Vector3d&, const dolfin::mesh::Mesh&) const)
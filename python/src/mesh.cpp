@@ -126,6 +126,8 @@ void mesh(py::module& m)
            py::overload_cast<>(&dolfin::mesh::Topology::cell_owner, py::const_))
       .def("global_indices",
            [](const dolfin::mesh::Topology& self, int dim) {
+             // Copy, since the indices may be replaced (e.g. by
+             // set_global_indices), which would invalidate a view
              auto& indices = self.global_indices(dim);
              return py::array_t<std::int64_t>(indices.size(), indices.data());
            })
@@ -201,10 +203,12 @@ void mesh(py::module& m)
            py::return_value_policy::reference_internal)
       .def("connections",
            py::overload_cast<>(&dolfin::mesh::Connectivity::connections),
-           "Connections for all mesh entities")
+           "Connections for all mesh entities",
+           py::return_value_policy::reference_internal)
       .def("pos",
            py::overload_cast<>(&dolfin::mesh::Connectivity::entity_positions),
-           "Index to each entity in the connectivity array")
+           "Index to each entity in the connectivity array",
+           py::return_value_policy::reference_internal)
       .def("size", &dolfin::mesh::Connectivity::size);
 
   // dolfin::mesh::MeshEntity class
@@ -295,12 +299,28 @@ void mesh(py::module& m)
            (bool (dolfin::mesh::MeshValueCollection<SCALAR>::*)(               \
                std::size_t, std::size_t, const SCALAR&))                       \
                & dolfin::mesh::MeshValueCollection<SCALAR>::set_value)         \
+      .def("set_values",                                                       \
+           &dolfin::mesh::MeshValueCollection<SCALAR>::set_values,             \
+           py::arg("cell_indices"), py::arg("local_entities"),                 \
+           py::arg("values"))                                                  \
+      .def("cell_indices",                                                     \
+           &dolfin::mesh::MeshValueCollection<SCALAR>::cell_indices,           \
+           py::return_value_policy::reference_internal,                        \
+           "Return a view of the cell indices of all values. The view is "     \
+           "invalidated by any change to the collection.")                     \
+      .def("local_entities",                                                   \
+           &dolfin::mesh::MeshValueCollection<SCALAR>::local_entities,         \
+           py::return_value_policy::reference_internal,                        \
+           "Return a view of the local entity indices of all values. The "     \
+           "view is invalidated by any change to the collection.")             \
       .def("values",                                                           \
-           (std::map<                                                          \
-                std::pair<std::size_t, std::size_t>,                           \
-                SCALAR> & (dolfin::mesh::MeshValueCollection<SCALAR>::*)())    \
-               & dolfin::mesh::MeshValueCollection<SCALAR>::values,            \
-           py::return_value_policy::reference)                                 \
+           py::overload_cast<>(                                                \
+               &dolfin::mesh::MeshValueCollection<SCALAR>::values),            \
+           py::return_value_policy::reference_internal,                        \
+           "Return a view of all values. The view is invalidated by any "      \
+           "change to the collection.")                                        \
+      .def("reserve", &dolfin::mesh::MeshValueCollection<SCALAR>::reserve)     \
+      .def("clear", &dolfin::mesh::MeshValueCollection<SCALAR>::clear)         \
       .def("assign",                                                           \
            [](dolfin::mesh::MeshValueCollection<SCALAR>& self,                 \
               const dolfin::mesh::MeshFunction<SCALAR>& mf) { self = mf; })    \
@@ -16,9 +16,12 @@ from petsc4py import PETSc
 import ufl
 from dolfin import (MPI, Function, FunctionSpace, TensorFunctionSpace,
                     UnitCubeMesh, VectorFunctionSpace, cpp, interpolate)
-from dolfin_utils.test.fixtures import fixture
+from dolfin.jit import cffi_expression
+from dolfin_utils.test.fixtures import fixture, tempdir
 from dolfin_utils.test.skips import skip_if_complex, skip_in_parallel
 
+assert (tempdir)
+
 
 @fixture
 def mesh():
@@ -167,12 +170,58 @@ def test_call(R, V, W, Q, mesh):
     tree = cpp.geometry.BoundingBoxTree(mesh, mesh.geometry.dim)
     assert np.allclose(u3(x0, tree)[:3], u2(x0, tree), rtol=1e-15, atol=1e-15)
 
+    # Evaluate into a pre-allocated array
+    values = np.empty((2, 9), dtype=PETSc.ScalarType)
+    x = np.array([x0, mesh.geometry.x(0)])
+    result = u3(x, tree, values=values)
+    assert result is values
+    assert np.allclose(values[0], u3(x0, tree), rtol=1e-15, atol=1e-15)
+    assert np.allclose(values[1], u3(mesh.geometry.x(0), tree), rtol=1e-15, atol=1e-15)
+
+    # Evaluate a single point into a pre-allocated array
+    value = np.empty(3, dtype=PETSc.ScalarType)
+    assert u2(x0, tree, values=value) is value
+    assert np.allclose(value, u3(x0, tree)[:3], rtol=1e-15, atol=1e-15)
+    with pytest.raises(ValueError):
+        u3(x0, tree, values=value)
+
+    # Arrays that cannot be evaluated into directly are rejected
+    with pytest.raises(ValueError):
+        u3(x, tree, values=np.empty((9, 2), dtype=PETSc.ScalarType).T)
+    with pytest.raises(ValueError):
+        u2(x0, tree, values=np.empty(3, dtype=np.float32))
+
     with pytest.raises(ValueError):
         u0([0, 0, 0, 0], tree)
     with pytest.raises(ValueError):
         u0([0, 0], tree)
 
 
+@skip_in_parallel
+def test_call_many_points(W, mesh):
+    u = Function(W)
+
+    def e(values, x):
+        values[:, 0] = x[:, 0] + 2.0 * x[:, 1]
+        values[:, 1] = x[:, 1] * x[:, 2]
+        values[:, 2] = -x[:, 2]
+
+    u.interpolate(e)
+    tree = cpp.geometry.BoundingBoxTree(mesh, mesh.geometry.dim)
+
+    # Add points close to the first few points, so that several points
+    # lie in the same cell, and shuffle so they are not in cell order
+    rng = np.random.RandomState(3)
+    x = rng.uniform(0.1, 0.9, size=(20, 3))
+    x = np.vstack([x, x[:5] + 1.0e-4, x[:5] - 1.0e-4])
+    x = x[rng.permutation(x.shape[0])]
+
+    values = u(x, tree)
+    assert values.shape == (x.shape[0], 3)
+    for i in range(x.shape[0]):
+        assert np.allclose(values[i], u(x[i], tree), rtol=1e-15, atol=1e-15)
+
+
 def test_scalar_conditions(R):
     c = Function(R)
     c.vector.set(1.5)
@@ -325,3 +374,69 @@ def test_cffi_expression(V):
     f2 = Function(V)
     f2.interpolate(expr_eval2)
     assert (f1.vector - f2.vector).norm() < 1.0e-12
+
+
+def test_cffi_expression_jit(V, W, tempdir):
+    f1 = Function(V)
+    f1.interpolate(cffi_expression("x[0] + x[1]", cache_dir=tempdir))
+
+    def expr_eval2(values, x):
+        values[:, 0] = x[:, 0] + x[:, 1]
+
+    f2 = Function(V)
+    f2.interpolate(expr_eval2)
+    assert (f1.vector - f2.vector).norm() < 1.0e-12
+
+    # Same source gives the same (cached) kernel
+    assert cffi_expression("x[0] + x[1]", cache_dir=tempdir) == cffi_expression(["x[0] + x[1]"])
+
+    w1 = Function(W)
+    w1.interpolate(cffi_expression(["x[0]", "2.0 * x[1]", "sin(x[2])"], cache_dir=tempdir))
+
+    def vector_eval(values, x):
+        values[:, 0] = x[:, 0]
+        values[:, 1] = 2.0 * x[:, 1]
+        values[:, 2] = np.sin(x[:, 2])
+
+    w2 = Function(W)
+    w2.interpolate(vector_eval)
+    assert (w1.vector - w2.vector).norm() < 1.0e-12
+
+
+def test_numba_expression(V, W):
+    numba = pytest.importorskip("numba")
+
+    @numba.njit
+    def expr_eval(values, x):
+        values[:, 0] = x[:, 0] + x[:, 1]
+
+    def expr_eval_py(values, x):
+        values[:, 0] = x[:, 0] + x[:, 1]
+
+    f1 = Function(V)
+    f1.interpolate(expr_eval)
+    f2 = Function(V)
+    f2.interpolate(expr_eval_py)
+    assert (f1.vector - f2.vector).norm() < 1.0e-12
+
+    # Re-use of the cached kernel
+    f1.vector.set(0.0)
+    f1.interpolate(expr_eval)
+    assert (f1.vector - f2.vector).norm() < 1.0e-12
+
+    @numba.njit
+    def vector_eval(values, x):
+        values[:, 0] = x[:, 0]
+        values[:, 1] = 2.0 * x[:, 1]
+        values[:, 2] = 3.0 * x[:, 2]
+
+    def vector_eval_py(values, x):
+        values[:, 0] = x[:, 0]
+        values[:, 1] = 2.0 * x[:, 1]
+        values[:, 2] = 3.0 * x[:, 2]
+
+    w1 = Function(W)
+    w1.interpolate(vector_eval)
+    w2 = Function(W)
+    w2.interpolate(vector_eval_py)
+    assert (w1.vector - w2.vector).norm() < 1.0e-12
@@ -82,6 +82,15 @@ def test_component(V, W, Q):
     assert Q.sub(1).component()[0] == 1
 
 
+def test_sub_all(W, Q):
+    for V in (W, Q):
+        subs = V.sub_all()
+        assert len(subs) == V.num_sub_spaces()
+        for i, Vi in enumerate(subs):
+            assert Vi is V.sub(i)
+            assert Vi.component()[0] == i
+
+
 def test_equality(V, V2, W, W2):
     assert V == V
     assert V == V2
@@ -21,8 +21,8 @@ def test_compute_collisions_point_1d():
 
     p = numpy.array([0.3, 0, 0])
     mesh = UnitIntervalMesh(MPI.comm_world, 16)
+    tree = BoundingBoxTree(mesh, mesh.topology.dim)
     for dim in range(1, 2):
-        tree = BoundingBoxTree(mesh, mesh.topology.dim)
         entities = tree.compute_collisions_point(p)
         assert set(entities) == reference[dim]
 
@@ -62,6 +62,18 @@ def test_compute_collisions_point_3d():
             assert set(entities) == reference[dim]
 
 
+@skip_in_parallel
+def test_compute_collisions_points_3d():
+    points = numpy.array([[0.3, 0.3, 0.3], [0.5, 0.1, 0.9], [2.0, 0.0, 0.0]])
+    mesh = UnitCubeMesh(MPI.comm_world, 8, 8, 8)
+    tree = BoundingBoxTree(mesh, mesh.topology.dim)
+    entities = tree.compute_collisions_points(points)
+    assert len(entities) == len(points)
+    for p, e in zip(points, entities):
+        assert set(e) == set(tree.compute_collisions_point(p))
+    assert not entities[2]
+
+
 # --- compute_collisions with tree ---
 
 
@@ -75,14 +87,15 @@ def test_compute_collisions_tree_1d():
 
     points = [numpy.array([0.52, 0, 0]), numpy.array([0.9, 0, 0])]
 
-    for i, point in enumerate(points):
-        mesh_A = UnitIntervalMesh(MPI.comm_world, 16)
-        mesh_B = UnitIntervalMesh(MPI.comm_world, 16)
+    mesh_A = UnitIntervalMesh(MPI.comm_world, 16)
+    mesh_B = UnitIntervalMesh(MPI.comm_world, 16)
+    tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
 
-        bgeom = mesh_B.geometry.points
-        bgeom += point[0]
+    # Translate mesh_B from its original position for each point
+    orig = mesh_B.geometry.points.copy()
+    for i, point in enumerate(points):
+        numpy.add(orig, point[0], out=mesh_B.geometry.points)
 
-        tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
         tree_B = BoundingBoxTree(mesh_B, mesh_B.topology.dim)
 
         entities_A, entities_B = tree_A.compute_collisions_bb(tree_B)
@@ -100,15 +113,15 @@ def test_compute_collisions_tree_2d():
 
     points = [numpy.array([0.52, 0.51, 0.0]), numpy.array([0.9, -0.9, 0.0])]
 
-    for i, point in enumerate(points):
+    mesh_A = UnitSquareMesh(MPI.comm_world, 4, 4)
+    mesh_B = UnitSquareMesh(MPI.comm_world, 4, 4)
+    tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
 
-        mesh_A = UnitSquareMesh(MPI.comm_world, 4, 4)
-        mesh_B = UnitSquareMesh(MPI.comm_world, 4, 4)
-
-        bgeom = mesh_B.geometry.points
-        bgeom += point
+    # Translate mesh_B from its original position for each point
+    orig = mesh_B.geometry.points.copy()
+    for i, point in enumerate(points):
+        numpy.add(orig, point, out=mesh_B.geometry.points)
 
-        tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
         tree_B = BoundingBoxTree(mesh_B, mesh_B.topology.dim)
 
         entities_A, entities_B = tree_A.compute_collisions_bb(tree_B)
@@ -131,15 +144,15 @@ def test_compute_collisions_tree_3d():
     points = [numpy.array([0.52, 0.51, 0.3]),
               numpy.array([0.9, -0.9, 0.3])]
 
-    for i, point in enumerate(points):
-
-        mesh_A = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
-        mesh_B = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
+    mesh_A = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
+    mesh_B = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
+    tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
 
-        bgeom = mesh_B.geometry.points
-        bgeom += point
+    # Translate mesh_B from its original position for each point
+    orig = mesh_B.geometry.points.copy()
+    for i, point in enumerate(points):
+        numpy.add(orig, point, out=mesh_B.geometry.points)
 
-        tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
         tree_B = BoundingBoxTree(mesh_B, mesh_B.topology.dim)
 
         entities_A, entities_B = tree_A.compute_collisions_bb(tree_B)
@@ -193,15 +206,15 @@ def test_compute_entity_collisions_tree_1d():
 
     points = [numpy.array([0.52, 0, 0]), numpy.array([0.9, 0, 0])]
 
-    for i, point in enumerate(points):
-
-        mesh_A = UnitIntervalMesh(MPI.comm_world, 16)
-        mesh_B = UnitIntervalMesh(MPI.comm_world, 16)
+    mesh_A = UnitIntervalMesh(MPI.comm_world, 16)
+    mesh_B = UnitIntervalMesh(MPI.comm_world, 16)
+    tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
 
-        bgeom = mesh_B.geometry.points
-        bgeom += point[0]
+    # Translate mesh_B from its original position for each point
+    orig = mesh_B.geometry.points.copy()
+    for i, point in enumerate(points):
+        numpy.add(orig, point[0], out=mesh_B.geometry.points)
 
-        tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
         tree_B = BoundingBoxTree(mesh_B, mesh_B.topology.dim)
 
         entities_A, entities_B = tree_A.compute_entity_collisions_bb_mesh(
@@ -219,14 +232,15 @@ def test_compute_entity_collisions_tree_2d():
     ], [set([6]), set([25])]]
 
     points = [numpy.array([0.52, 0.51, 0.0]), numpy.array([0.9, -0.9, 0.0])]
-    for i, point in enumerate(points):
-        mesh_A = UnitSquareMesh(MPI.comm_world, 4, 4)
-        mesh_B = UnitSquareMesh(MPI.comm_world, 4, 4)
+    mesh_A = UnitSquareMesh(MPI.comm_world, 4, 4)
+    mesh_B = UnitSquareMesh(MPI.comm_world, 4, 4)
+    tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
 
-        bgeom = mesh_B.geometry.points
-        bgeom += point
+    # Translate mesh_B from its original position for each point
+    orig = mesh_B.geometry.points.copy()
+    for i, point in enumerate(points):
+        numpy.add(orig, point, out=mesh_B.geometry.points)
 
-        tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
         tree_B = BoundingBoxTree(mesh_B, mesh_B.topology.dim)
 
         entities_A, entities_B = tree_A.compute_entity_collisions_bb_mesh(
@@ -245,15 +259,15 @@ def test_compute_entity_collisions_tree_3d():
         set([15, 16, 17, 39, 41])]]
 
     points = [numpy.array([0.52, 0.51, 0.3]), numpy.array([0.9, -0.9, 0.3])]
-    for i, point in enumerate(points):
+    mesh_A = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
+    mesh_B = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
+    tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
 
-        mesh_A = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
-        mesh_B = UnitCubeMesh(MPI.comm_world, 2, 2, 2)
-
-        bgeom = mesh_B.geometry.points
-        bgeom += point
+    # Translate mesh_B from its original position for each point
+    orig = mesh_B.geometry.points.copy()
+    for i, point in enumerate(points):
+        numpy.add(orig, point, out=mesh_B.geometry.points)
 
-        tree_A = BoundingBoxTree(mesh_A, mesh_A.topology.dim)
         tree_B = BoundingBoxTree(mesh_B, mesh_B.topology.dim)
 
         entities_A, entities_B = tree_A.compute_entity_collisions_bb_mesh(
@@ -58,7 +58,7 @@ def test_save_and_read_meshfunction_2D(tempdir):
             mf = MeshFunction('double', mesh, i, 0.0)
             # NB choose a value to set which will be the same on every
             # process for each entity
-            mf.values[:] = cpp.mesh.midpoints(mesh, i, range(mesh.num_entities(i)))[:, 0]
+            mf.values[:] = cpp.mesh.midpoints(mesh, i, numpy.arange(mesh.num_entities(i), dtype=numpy.int32))[:, 0]
             meshfunctions.append(mf)
             mf_file.write(mf, "/meshfunction/meshfun%d" % i)
 
@@ -80,7 +80,7 @@ def test_save_and_read_meshfunction_3D(tempdir):
     meshfunctions = []
     for i in range(0, 4):
         mf = MeshFunction('double', mesh, i, 0.0)
-        mp = cpp.mesh.midpoints(mesh, i, range(mesh.num_entities(i)))
+        mp = cpp.mesh.midpoints(mesh, i, numpy.arange(mesh.num_entities(i), dtype=numpy.int32))
 
         # NB choose a value to set which will be the same on every
         # process for each entity
@@ -109,7 +109,7 @@ def test_save_and_read_mesh_value_collection(tempdir):
         for dim in range(mesh.topology.dim):
             mvc = MeshValueCollection("size_t", mesh, dim)
             mesh.create_entities(dim)
-            mp = cpp.mesh.midpoints(mesh, dim, range(mesh.num_entities(dim)))
+            mp = cpp.mesh.midpoints(mesh, dim, numpy.arange(mesh.num_entities(dim), dtype=numpy.int32))
             for e in range(mesh.num_entities(dim)):
                 # this can be easily computed to the check the value
                 val = int(ndiv * mp[e].sum()) + 1
@@ -120,9 +120,9 @@ def test_save_and_read_mesh_value_collection(tempdir):
     with HDF5File(mesh.mpi_comm(), filename, 'r') as f:
         for dim in range(mesh.topology.dim):
             mvc = f.read_mvc_size_t(mesh, "/mesh_value_collection_{}".format(dim))
-            mp = cpp.mesh.midpoints(mesh, dim, range(mesh.num_entities(dim)))
+            mp = cpp.mesh.midpoints(mesh, dim, numpy.arange(mesh.num_entities(dim), dtype=numpy.int32))
             # check the values
-            for (cell, lidx), val in mvc.values().items():
+            for cell, lidx, val in zip(mvc.cell_indices(), mvc.local_entities(), mvc.values()):
                 eidx = MeshEntity(mesh, mesh.topology.dim, cell).entities(dim)[lidx]
                 mid = mp[eidx]
                 assert val == int(ndiv * mid.sum()) + 1
@@ -544,7 +544,7 @@ def test_save_mesh_value_collection(tempdir, encoding, data_type):
     tdim = mesh.topology.dim
     meshfn = MeshFunction(dtype_str, mesh, mesh.topology.dim, False)
     meshfn.name = "volume_marker"
-    mp = cpp.mesh.midpoints(mesh, tdim, range(mesh.num_entities(tdim)))
+    mp = cpp.mesh.midpoints(mesh, tdim, numpy.arange(mesh.num_entities(tdim), dtype=numpy.int32))
     for i in range(mesh.num_cells()):
         if mp[i, 1] > 0.1:
             meshfn.values[i] = 1
@@ -556,7 +556,7 @@ def test_save_mesh_value_collection(tempdir, encoding, data_type):
         tag = "dim_{}_marker".format(mvc_dim)
         mvc.name = tag
         mesh.create_connectivity(mvc_dim, tdim)
-        mp = cpp.mesh.midpoints(mesh, mvc_dim, range(mesh.num_entities(mvc_dim)))
+        mp = cpp.mesh.midpoints(mesh, mvc_dim, numpy.arange(mesh.num_entities(mvc_dim), dtype=numpy.int32))
         for e in range(mesh.num_entities(mvc_dim)):
             if (mp[e, 0] > 0.5):
                 mvc.set_value(e, dtype(1))
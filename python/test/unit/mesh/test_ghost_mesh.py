@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import numpy
 import pytest
 
 from dolfin import MPI, UnitCubeMesh, UnitIntervalMesh, UnitSquareMesh, cpp
@@ -84,8 +85,8 @@ def test_ghost_connectivities(mode):
 
     # Create reference mapping from facet midpoint to cell midpoint
     reference = {}
-    facet_mp = cpp.mesh.midpoints(meshR, tdim - 1, range(meshR.num_entities(tdim - 1)))
-    cell_mp = cpp.mesh.midpoints(meshR, tdim, range(meshR.num_entities(tdim)))
+    facet_mp = cpp.mesh.midpoints(meshR, tdim - 1, numpy.arange(meshR.num_entities(tdim - 1), dtype=numpy.int32))
+    cell_mp = cpp.mesh.midpoints(meshR, tdim, numpy.arange(meshR.num_entities(tdim), dtype=numpy.int32))
     reference = dict.fromkeys([tuple(row) for row in facet_mp], [])
     for i in range(meshR.num_entities(tdim - 1)):
         for cidx in meshR.topology.connectivity(1, 2).connections(i):
@@ -95,8 +96,8 @@ def test_ghost_connectivities(mode):
     tdim = meshG.topology.dim
     num_facets = meshG.num_entities(tdim - 1) - meshG.topology.ghost_offset(tdim - 1)
     allowable_cell_indices = range(meshG.num_cells())
-    facet_mp = cpp.mesh.midpoints(meshG, tdim - 1, range(meshG.num_entities(tdim - 1)))
-    cell_mp = cpp.mesh.midpoints(meshG, tdim, range(meshG.num_entities(tdim)))
+    facet_mp = cpp.mesh.midpoints(meshG, tdim - 1, numpy.arange(meshG.num_entities(tdim - 1), dtype=numpy.int32))
+    cell_mp = cpp.mesh.midpoints(meshG, tdim, numpy.arange(meshG.num_entities(tdim), dtype=numpy.int32))
     for i in range(num_facets):
         assert tuple(facet_mp[i]) in reference
         for cidx in meshG.topology.connectivity(1, 2).connections(i):
@@ -4,165 +4,170 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import numpy as np
+import pytest
+
 from dolfin import MPI, MeshFunction, MeshValueCollection, UnitSquareMesh, cpp
+from dolfin_utils.test.fixtures import fixture
 
 
-def test_assign_2D_cells():
-    mesh = UnitSquareMesh(MPI.comm_world, 3, 3)
-    ncells = mesh.num_cells()
-    f = MeshValueCollection("int", mesh, 2)
-    all_new = True
-    for c in range(ncells):
-        value = ncells - c
-        all_new = all_new and f.set_value(c, value)
-    g = MeshValueCollection("int", mesh, 2)
-    g.assign(f)
-    assert ncells == f.size()
-    assert ncells == g.size()
-    assert all_new
+@fixture
+def mesh():
+    mesh = UnitSquareMesh(MPI.comm_self, 3, 3)
 
-    for c in range(ncells):
-        value = ncells - c
-        assert value, g.get_value(c == 0)
+    # Create the entities and connectivity used by the tests up front,
+    # so that all tests share them
+    mesh.create_entities(1)
+    mesh.create_entities(0)
+    mesh.create_connectivity(2, 1)
+    mesh.create_connectivity(2, 0)
+    return mesh
 
-    old_value = g.get_value(0, 0)
-    g.set_value(0, 0, old_value + 1)
-    assert old_value + 1 == g.get_value(0, 0)
 
+@fixture
+def cells(mesh):
+    return np.arange(mesh.num_cells(), dtype=np.int32)
 
-def test_assign_2D_facets():
-    mesh = UnitSquareMesh(MPI.comm_world, 3, 3)
-    mesh.create_connectivity(2, 1)
-    tdim = mesh.topology.dim
-    num_cell_facets = cpp.mesh.cell_num_entities(mesh.cell_type, tdim - 1)
-    ncells = mesh.num_cells()
 
-    f = MeshValueCollection("int", mesh, 1)
-    all_new = True
-    for c in range(ncells):
-        value = ncells - c
-        for i in range(num_cell_facets):
-            all_new = all_new and f.set_value(c, i, value + i)
+@fixture
+def mvc_pool(mesh):
+    # Collections shared by the tests, two for each entity dimension.
+    # Tests clear them before use, which keeps the allocated storage.
+    return {dim: [MeshValueCollection("int", mesh, dim) for i in range(2)]
+            for dim in range(mesh.topology.dim + 1)}
 
-    g = MeshValueCollection("int", mesh, 1)
-    g.assign(f)
-    assert ncells * 3 == f.size()
-    assert ncells * 3 == g.size()
-    assert all_new
 
-    for c in range(ncells):
-        value = ncells - c
-        for i in range(num_cell_facets):
-            assert value + i == g.get_value(c, i)
+@pytest.mark.parametrize("dim", [0, 1, 2])
+def test_assign_2D(mesh, cells, mvc_pool, dim):
+    ncells = mesh.num_cells()
+    num_cell_entities = cpp.mesh.cell_num_entities(mesh.cell_type, dim)
 
+    f, g = mvc_pool[dim]
+    f.clear()
 
-def test_assign_2D_vertices():
-    mesh = UnitSquareMesh(MPI.comm_world, 3, 3)
-    mesh.create_connectivity(2, 0)
-    ncells = mesh.num_cells()
-    num_cell_vertices = cpp.mesh.cell_num_vertices(mesh.cell_type)
+    # Reserving storage does not add entries
+    f.reserve(ncells * num_cell_entities)
+    assert f.size() == 0
 
-    f = MeshValueCollection("int", mesh, 0)
-    all_new = True
-    for c in range(ncells):
-        value = ncells - c
-        for i in range(num_cell_vertices):
-            all_new = all_new and f.set_value(c, i, value + i)
+    cells = np.repeat(cells, num_cell_entities)
+    local = np.tile(np.arange(num_cell_entities, dtype=np.int32), ncells)
+    num_new = f.set_values(cells, local, ncells - cells + local)
 
-    g = MeshValueCollection("int", mesh, 0)
     g.assign(f)
-    assert ncells * 3 == f.size()
-    assert ncells * 3 == g.size()
-    assert all_new
+    assert ncells * num_cell_entities == f.size()
+    assert ncells * num_cell_entities == g.size()
+    assert num_new == ncells * num_cell_entities
 
-    for c in range(ncells):
-        value = ncells - c
-        for i in range(num_cell_vertices):
-            assert value + i == g.get_value(c, i)
+    # Check all entries at once, equivalent to
+    # assert value == g.get_value(cell, local) for each entry
+    np.testing.assert_array_equal(g.cell_indices(), cells)
+    np.testing.assert_array_equal(g.local_entities(), local)
+    np.testing.assert_array_equal(g.values(), ncells - cells + local)
 
+    old_value = g.get_value(0, 0)
+    g.set_value(0, 0, old_value + 1)
+    assert old_value + 1 == g.get_value(0, 0)
 
-def test_mesh_function_assign_2D_cells():
-    mesh = UnitSquareMesh(MPI.comm_world, 3, 3)
-    ncells = mesh.num_cells()
-    f = MeshFunction("int", mesh, mesh.topology.dim, 0)
-    for c in range(ncells):
-        f.values[c] = ncells - c
 
-    g = MeshValueCollection("int", mesh, 2)
-    g.assign(f)
-    assert ncells == len(f.values)
-    assert ncells == g.size()
+def test_set_values_unsorted(mesh, mvc_pool):
+    f = mvc_pool[1][0]
+    f.clear()
+    assert f.set_values(np.array([4, 2, 4, 0], dtype=np.int32), np.array([1, 0, 1, 2], dtype=np.int32),
+                        np.array([1, 2, 3, 4], dtype=np.int32)) == 3
+    assert f.set_values(np.array([2, 1, 1], dtype=np.int32), np.array([0, 2, 2], dtype=np.int32),
+                        np.array([5, 6, 7], dtype=np.int32)) == 1
 
-    f2 = MeshFunction("int", mesh, g, 0)
+    # Entries are sorted, and the last value set for an entity is kept
+    np.testing.assert_array_equal(f.cell_indices(), [0, 1, 2, 4])
+    np.testing.assert_array_equal(f.local_entities(), [2, 2, 0, 1])
+    np.testing.assert_array_equal(f.values(), [4, 7, 5, 3])
+    assert f.get_value(4, 1) == 3
 
-    for c in range(mesh.num_cells()):
-        value = ncells - c
-        assert value == g.get_value(c, 0)
-        assert f2.values[c] == g.get_value(c, 0)
+    # Local entity indices must be in [0, 127]
+    with pytest.raises(RuntimeError):
+        f.set_values(np.array([0], dtype=np.int32), np.array([128], dtype=np.int32), np.array([1], dtype=np.int32))
+    with pytest.raises(RuntimeError):
+        f.set_value(0, 200, 1)
 
-    h = MeshValueCollection("int", mesh, 2)
-    global_indices = mesh.topology.global_indices(2)
-    ncells_global = mesh.num_entities_global(2)
-    for c in range(mesh.num_cells()):
-        if global_indices[c] in [5, 8, 10]:
-            continue
-        value = ncells_global - global_indices[c]
-        h.set_value(c, int(value))
 
-    f3 = MeshFunction("int", mesh, h, 0)
+def test_views_after_mutation(mesh, mvc_pool):
+    f = mvc_pool[2][0]
+    f.clear()
+    f.set_values(np.array([1], dtype=np.int32), np.array([0], dtype=np.int32), np.array([5], dtype=np.int32))
+    assert f.values()[0] == 5
 
-    values = f3.values
-    values[values > ncells_global] = 0.
+    # Arrays returned before a change may refer to freed storage, so
+    # get them again after changing the collection
+    cells = np.arange(mesh.num_cells(), dtype=np.int32)[::-1].copy()
+    f.set_values(cells, np.zeros_like(cells), 2 * cells)
+    np.testing.assert_array_equal(f.cell_indices(), np.arange(mesh.num_cells()))
+    np.testing.assert_array_equal(f.values(), 2 * np.arange(mesh.num_cells()))
 
-    assert MPI.sum(mesh.mpi_comm(), values.sum() * 1.0) == 140.
+    f.clear()
+    assert f.values().size == 0
+    assert f.cell_indices().size == 0
 
 
-def test_mesh_function_assign_2D_facets():
-    mesh = UnitSquareMesh(MPI.comm_world, 3, 3)
-    mesh.create_entities(1)
+@pytest.mark.parametrize("dim", [0, 1, 2])
+def test_mesh_function_assign_2D(mesh, cells, mvc_pool, dim):
     tdim = mesh.topology.dim
-    num_cell_facets = cpp.mesh.cell_num_entities(mesh.cell_type, tdim - 1)
-
-    f = MeshFunction("int", mesh, tdim - 1, 25)
-    connectivity = mesh.topology.connectivity(tdim, tdim - 1)
-    for c in range(mesh.num_cells()):
-        facets = connectivity.connections(c)
-        for i in range(num_cell_facets):
-            assert 25 == f.values[facets[i]]
-
-    g = MeshValueCollection("int", mesh, 1)
+    ncells = mesh.num_cells()
+    num_entities = mesh.num_entities(dim)
+    num_cell_entities = cpp.mesh.cell_num_entities(mesh.cell_type, dim)
+
+    # Entities of each cell, (ncells, num_cell_entities)
+    if dim == tdim:
+        cell_entities = cells.reshape(-1, 1)
+    else:
+        connectivity = mesh.topology.connectivity(tdim, dim)
+        cell_entities = connectivity.connections().reshape(ncells, num_cell_entities)
+
+    f = MeshFunction("int", mesh, dim, 25)
+    values = f.values
+    assert np.all(values == 25)
+    values[:] = num_entities - np.arange(num_entities, dtype=values.dtype)
+
+    g = mvc_pool[dim][0]
+    g.clear()
     g.assign(f)
-    assert mesh.num_entities(tdim - 1) == len(f.values)
-    assert mesh.num_cells() * 3 == g.size()
-    for c in range(mesh.num_cells()):
-        for i in range(num_cell_facets):
-            assert 25 == g.get_value(c, i)
+    assert num_entities == len(values)
+    assert ncells * num_cell_entities == g.size()
 
     f2 = MeshFunction("int", mesh, g, 0)
 
-    connectivity = mesh.topology.connectivity(tdim, tdim - 1)
-    for c in range(mesh.num_cells()):
-        facets = connectivity.connections(c)
-        for i in range(num_cell_facets):
-            assert f2.values[facets[i]] == g.get_value(c, i)
+    expected = num_entities - cell_entities
+    np.testing.assert_array_equal(g.values().reshape(ncells, num_cell_entities), expected)
+    np.testing.assert_array_equal(f2.values[cell_entities], expected)
 
 
-def test_mesh_function_assign_2D_vertices():
-    mesh = UnitSquareMesh(MPI.comm_world, 3, 3)
-    mesh.create_entities(0)
-    f = MeshFunction("int", mesh, 0, 25)
-    g = MeshValueCollection("int", mesh, 0)
+def test_mesh_function_assign_nonempty(mesh, mvc_pool):
+    g = mvc_pool[1][0]
+    g.clear()
+    g.set_value(3, 1, -1)
+
+    f = MeshFunction("int", mesh, 1, 7)
     g.assign(f)
-    assert mesh.num_entities(0) == len(f.values)
-    assert mesh.num_cells() * 3 == g.size()
 
-    f2 = MeshFunction("int", mesh, g, 0)
+    # Existing entries are kept, and all other cell entities are added
+    assert g.size() == mesh.num_cells() * 3
+    assert g.get_value(3, 1) == -1
+    assert np.count_nonzero(g.values() == 7) == g.size() - 1
 
-    num_cell_vertices = cpp.mesh.cell_num_vertices(mesh.cell_type)
+
+def test_mesh_function_assign_2D_cells_subset(mesh, cells, mvc_pool):
     tdim = mesh.topology.dim
-    connectivity = mesh.topology.connectivity(tdim, 0)
-    for c in range(mesh.num_cells()):
-        vertices = connectivity.connections(c)
-        for i in range(num_cell_vertices):
-            assert 25 == g.get_value(c, i)
-            assert f2.values[vertices[i]] == g.get_value(c, i)
+    h = mvc_pool[tdim][0]
+    h.clear()
+    global_indices = mesh.topology.global_indices(tdim)
+    ncells_global = mesh.num_entities_global(tdim)
+    cells = cells[~np.isin(global_indices, [5, 8, 10])]
+    values = (ncells_global - global_indices[cells]).astype(np.int32)
+    h.set_values(cells, np.zeros_like(cells), values)
+
+    f3 = MeshFunction("int", mesh, h, 0)
+
+    values = f3.values
+    np.putmask(values, values > ncells_global, 0)
+
+    # The mesh is on comm_self, so no reduction over processes is needed
+    assert values.sum(dtype=np.int64) == 140